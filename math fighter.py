@@ -6,22 +6,32 @@ Boxing Math Game v3 — Two-Digit Subtraction with Borrowing + Round Limit
 """
 
 import argparse
+import itertools
 import random
 import sys
-from typing import Tuple, List
+from typing import Tuple, List, Optional
+
+# The game is I/O-bound: the dominant cost is input() waiting on a player,
+# and all numeric work is O(1) per round. Keep this module pure CPython and
+# specialise hot helpers by hand (precomputed cumulative weights, batched
+# rolls, local bindings) rather than JIT-compiling them -- Numba's import and
+# first-call compile cost far more than a whole game's arithmetic. Any JIT
+# added in a sibling module must stay opt-in behind MATHFIGHTER_JIT.
 
 ATTACK_RANGE = (11, 49)
 DEFENSE_RANGE = (0, 50)
 LIFE_RANGE = (80, 120)
 MAX_ATTEMPTS = 3
-MAX_REROLLS_FOR_BORROW = 12
 
-ATTACK_NAMES: List[str] = [
+# randint(a, b) is a thin wrapper over randrange(a, b + 1); call the latter directly.
+_randrange = random.randrange
+
+ATTACK_NAMES: Tuple[str, ...] = (
     "Comet Cross", "Dragon Hook", "Phantom Jab", "Thunder Uppercut", "Shadow Step",
     "Cyclone Smash", "Blazing Elbow", "Nebula Feint", "Meteor Rush", "Vortex Swing",
     "Falcon Strike", "Aurora Burst", "Riptide Punch", "Sonic Boom", "Iron Hammer",
     "Starlight Flicker", "Quasar Cut", "Tempest Knuckle", "Glacier Chop", "Solar Slam"
-]
+)
 
 class Style:
     def __init__(self, enable: bool):
@@ -32,152 +42,220 @@ class Style:
         self.red = "\033[31m" if enable else ""
         self.yellow = "\033[33m" if enable else ""
         self.blue = "\033[34m" if enable else ""
-
-    def wrap(self, text: str, color: str) -> str:
-        if not self.enable:
-            return text
+        # Pick the wrapper once so wrap() never re-checks self.enable.
+        self.wrap = self._wrap_color if enable else self._wrap_plain
+        # Static messages are wrapped once here rather than on every answer.
+        self.correct_msg = self.wrap("✅ Correct!", self.green)
+        self.reveal_tmpl = self.wrap("📘 The correct answer is: {}\n", self.blue)
+        self.status_tmpl = (self.wrap("🔹 {p1}: {h1} HP", self.blue) + " | "
+                            + self.wrap("🔸 {p2}: {h2} HP", self.yellow) + "\n")
+        self.round_tmpl = self.wrap("===== 🏁 Round {n} / {m} =====", self.bold)
+        self.nan_tmpl = self.wrap("❌ Please enter a whole number. Attempts left: {}", self.red)
+        self.retry_tmpl = self.wrap("❌ Not quite{}. Attempts left: {}", self.yellow)
+        self.hit_tmpl = self.wrap("📣 {a} hit {d} for {dmg}. {d} now has {hp} HP.\n", self.blue)
+
+    def _wrap_color(self, text: str, color: str) -> str:
         return f"{color}{text}{self.reset}"
 
+    @staticmethod
+    def _wrap_plain(text: str, color: str) -> str:
+        return text
+
 class Adaptive:
     def __init__(self):
         self.correct = 0
         self.total = 0
+        self.level = 1
 
     def update(self, is_correct: bool) -> None:
         self.total += 1
         if is_correct:
             self.correct += 1
+        # Level only changes here, so compute it once instead of on every read.
+        self.level = max(1, min(5, 1 + int(self.accuracy * 4)))
 
     @property
     def accuracy(self) -> float:
         return (self.correct / self.total) if self.total else 0.0
 
-    @property
-    def level(self) -> int:
-        return max(1, min(5, 1 + int(self.accuracy * 4)))
-
 ADAPT = Adaptive()
 
-def weighted_defense_roll(low: int, high: int) -> int:
-    values = list(range(low, high + 1))
-    weights = [(high + 1 - d) ** 2 for d in values]
-    return random.choices(values, weights=weights, k=1)[0]
+# Defense distribution is fixed, so build its cumulative weights once.
+_DEF_LOW, _DEF_HIGH = DEFENSE_RANGE
+_DEF_VALUES = tuple(range(_DEF_LOW, _DEF_HIGH + 1))
+_DEF_CUM = list(itertools.accumulate((_DEF_HIGH + 1 - d) ** 2 for d in _DEF_VALUES))
+_ATK_LO, _ATK_HI1 = ATTACK_RANGE[0], ATTACK_RANGE[1] + 1
+_ATK_VALUES = range(_ATK_LO, _ATK_HI1)
+
+# Batches are sized for at most this many rounds; KOs end games well before.
+_POOL_ROUNDS_CAP = 16
 
-def ask_int_with_attempts_bool(prompt: str, correct_value: int, max_attempts: int, style: Style) -> bool:
+# Attack names and rolls are drawn a batch at a time and handed out one by one.
+class RollPool:
+    def __init__(self):
+        self.batch = _POOL_ROUNDS_CAP + 4
+        self._names: List[str] = []
+        self._attacks: List[int] = []
+        self._defenses: List[int] = []
+
+    def reset(self, rounds: int) -> None:
+        # Each round uses one name, attack and defense; +4 leaves headroom.
+        self.batch = max(1, min(rounds, _POOL_ROUNDS_CAP)) + 4
+        self._names.clear()
+        self._attacks.clear()
+        self._defenses.clear()
+
+    def name(self) -> str:
+        if not self._names:
+            self._names = random.choices(ATTACK_NAMES, k=self.batch)
+        return self._names.pop()
+
+    def attack(self) -> int:
+        if not self._attacks:
+            self._attacks = random.choices(_ATK_VALUES, k=self.batch)
+        return self._attacks.pop()
+
+    def defense(self) -> int:
+        if not self._defenses:
+            self._defenses = random.choices(_DEF_VALUES, cum_weights=_DEF_CUM, k=self.batch)
+        return self._defenses.pop()
+
+ROLLS = RollPool()
+
+# Every answer in the game is a small non-negative number.
+_SMALL_INT = {str(i): i for i in range(200)}
+
+def parse_int(raw: str) -> Optional[int]:
+    val = _SMALL_INT.get(raw)
+    if val is not None:
+        return val
+    digits = raw[1:] if raw.startswith(("-", "+")) else raw
+    if not digits.isdecimal():
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        # Only reachable past int()'s digit limit (4300 digits by default).
+        return None
+
+def ask_int_with_attempts(prompt: str, correct_value: int, max_attempts: int, style: Style) -> bool:
     attempts = 0
     while attempts < max_attempts:
         raw = input(prompt).strip()
         if raw.lower() in {"quit", "exit"}:
             print("Exiting game. Bye!")
             raise SystemExit(0)
-        try:
-            val = int(raw)
-        except ValueError:
+        val = parse_int(raw)
+        if val is None:
             attempts += 1
-            print(style.wrap(f"❌ Please enter a whole number. Attempts left: {max_attempts - attempts}", style.red))
+            print(style.nan_tmpl.format(max_attempts - attempts))
             continue
         if val == correct_value:
-            print(style.wrap("✅ Correct!", style.green))
+            print(style.correct_msg)
             return True
         else:
             attempts += 1
             hint = ""
             if attempts < max_attempts:
                 hint = " (too high)" if val > correct_value else " (too low)"
-            print(style.wrap(f"❌ Not quite{hint}. Attempts left: {max_attempts - attempts}", style.yellow))
-    print(style.wrap(f"📘 The correct answer is: {correct_value}\n", style.blue))
+            print(style.retry_tmpl.format(hint, max_attempts - attempts))
+    print(style.reveal_tmpl.format(correct_value))
     return False
 
 def roll_attack() -> Tuple[str, int]:
-    name = random.choice(ATTACK_NAMES)
-    dmg = random.randint(*ATTACK_RANGE)
-    return name, dmg
+    return ROLLS.name(), ROLLS.attack()
 
 def roll_defense() -> int:
-    return weighted_defense_roll(*DEFENSE_RANGE)
+    return ROLLS.defense()
 
 def force_borrow_pair(level: int) -> Tuple[int, int]:
-    base_tens = random.randint(2, 9)
-    gap = random.randint(1 + level, min(9, 2 + 2 * level))
-    d_ones = random.randint(gap, 9)
+    base_tens = _randrange(2, 10)
+    gap = _randrange(1 + level, min(9, 2 + 2 * level) + 1)
+    d_ones = _randrange(gap, 10)
     b_ones = d_ones - gap
-    base = base_tens * 10 + b_ones
-    d_tens = random.randint(0, base_tens)
-    defense = d_tens * 10 + d_ones
-    if base <= defense:
-        base += 10
-    if (base % 10) >= (defense % 10):
-        defense = (defense // 10) * 10 + min(9, (base % 10) + 1)
-    return base, defense
+    d_tens = _randrange(0, base_tens + 1)
+    # b_ones < d_ones always, so base <= defense only when the tens tie.
+    if d_tens >= base_tens:
+        base_tens += 1
+    return base_tens * 10 + b_ones, d_tens * 10 + d_ones
+
+def _sample_borrow_pair() -> Tuple[int, int]:
+    # Build the digits directly: defense ones > base ones forces a borrow,
+    # defense tens < base tens keeps base > defense.
+    b_tens = _randrange(1, 5)
+    b_ones = _randrange(1 if b_tens == 1 else 0, 9)
+    d_ones = _randrange(b_ones + 1, 10)
+    d_tens = _randrange(0, b_tens)
+    return b_tens * 10 + b_ones, d_tens * 10 + d_ones
 
 def ensure_borrow_case(base: int, defense: int, life_before: int) -> Tuple[int, int]:
     if base <= defense:
         return base, defense
-    extra = (ADAPT.level - 1) * 4
-    for _ in range(MAX_REROLLS_FOR_BORROW + extra):
-        actual_damage = base - defense
-        if (base % 10) < (defense % 10) or (life_before % 10) < (actual_damage % 10):
-            return base, defense
-        if random.random() < 0.5:
-            base = random.randint(*ATTACK_RANGE)
-        else:
-            defense = roll_defense()
-        if base <= defense:
-            return base, defense
-    return base, defense
+    b_ones = base % 10
+    d_ones = defense % 10
+    # Without a borrow, the damage's ones digit is just b_ones - d_ones.
+    if b_ones < d_ones or (life_before % 10) < b_ones - d_ones:
+        return base, defense
+    return _sample_borrow_pair()
 
 def prompt_enter(msg: str = "Press Enter to continue...") -> None:
     input(msg)
 
-def print_status(p1_name: str, p1_hp: int, p2_name: str, p2_hp: int, style: Style) -> None:
-    print(f"{style.wrap('🔹 ' + p1_name + f': {p1_hp} HP', style.blue)} | "
-          f"{style.wrap('🔸 ' + p2_name + f': {p2_hp} HP', style.yellow)}\n")
+def format_status(p1_name: str, p1_hp: int, p2_name: str, p2_hp: int, style: Style) -> str:
+    return style.status_tmpl.format(p1=p1_name, h1=p1_hp, p2=p2_name, h2=p2_hp)
 
 def generate_pair(life_before: int) -> Tuple[str, int, int]:
+    level = ADAPT.level
     atk_name, base = roll_attack()
     defense = roll_defense()
-    p_force = 0.25 + 0.15 * (ADAPT.level - 1)
+    p_force = 0.25 + 0.15 * (level - 1)
     if random.random() < p_force:
-        base, defense = force_borrow_pair(ADAPT.level)
+        base, defense = force_borrow_pair(level)
     else:
         base, defense = ensure_borrow_case(base, defense, life_before)
     if defense >= base:
-        base, defense = force_borrow_pair(ADAPT.level)
+        base, defense = force_borrow_pair(level)
     return atk_name, base, defense
 
 def play_game(max_rounds: int, style: Style) -> None:
-    print(style.wrap("🥊 Boxing Math Game — Two-Digit Subtraction (Borrowing) v3", style.bold))
-    print("Type 'quit' or 'exit' at any input to end the game.\n")
+    sys.stdout.write(style.wrap("🥊 Boxing Math Game — Two-Digit Subtraction (Borrowing) v3", style.bold)
+                     + "\nType 'quit' or 'exit' at any input to end the game.\n\n")
 
     user1 = input("Enter Player 1 name (max 3 chars): ").strip() or "P1"
     user2 = input("Enter Player 2 name (max 3 chars): ").strip() or "P2"
     user1 = user1[:3]
     user2 = user2[:3]
 
-    p1_hp = random.randint(*LIFE_RANGE)
-    p2_hp = random.randint(*LIFE_RANGE)
+    ROLLS.reset(rounds=max_rounds)
+    names = (user1, user2)
+    hp = [random.randint(*LIFE_RANGE), random.randint(*LIFE_RANGE)]
 
-    print(f"\n{user1} and {user2} step into the ring!")
-    print(f"{user1} starts with {p1_hp} HP.")
-    print(f"{user2} starts with {p2_hp} HP.\n")
+    sys.stdout.write(f"\n{user1} and {user2} step into the ring!\n"
+                     f"{user1} starts with {hp[0]} HP.\n"
+                     f"{user2} starts with {hp[1]} HP.\n\n")
 
-    attacker, defender = user1, user2
+    # Index into names/hp; the attacker is always def_idx ^ 1.
+    def_idx = 1
     round_no = 1
 
-    while p1_hp > 0 and p2_hp > 0 and round_no <= max_rounds:
-        print(style.wrap(f"===== 🏁 Round {round_no} / {max_rounds} =====", style.bold))
-        print_status(user1, p1_hp, user2, p2_hp, style)
-
-        life_before = p1_hp if defender == user1 else p2_hp
+    while hp[0] > 0 and hp[1] > 0 and round_no <= max_rounds:
+        attacker, defender = names[def_idx ^ 1], names[def_idx]
+        life_before = hp[def_idx]
         atk_name, base_dmg, defense = generate_pair(life_before)
 
-        print(f"💥 {attacker} uses {atk_name}! Base damage roll: {base_dmg}")
+        # One write for the whole round header instead of a print per line.
+        out = [
+            style.round_tmpl.format(n=round_no, m=max_rounds),
+            format_status(user1, hp[0], user2, hp[1], style),
+            f"💥 {attacker} uses {atk_name}! Base damage roll: {base_dmg}",
+        ]
+        sys.stdout.write("\n".join(out) + "\n")
         prompt_enter(f"🛡️  {defender}, press Enter to roll your defense...")
         print(f"🛡️  {defender} defense roll: {defense}")
 
         actual_damage = base_dmg - defense
 
-        ok1 = ask_int_with_attempts_bool(
+        ok1 = ask_int_with_attempts(
             prompt=f"❓ What is the ACTUAL damage? (base {base_dmg} - defense {defense}): ",
             correct_value=actual_damage,
             max_attempts=MAX_ATTEMPTS,
@@ -186,7 +264,7 @@ def play_game(max_rounds: int, style: Style) -> None:
         ADAPT.update(ok1)
 
         expected_remaining = max(0, life_before - actual_damage)
-        ok2 = ask_int_with_attempts_bool(
+        ok2 = ask_int_with_attempts(
             prompt=f"❓ What is {defender}'s REMAINING life? ({life_before} - {actual_damage}): ",
             correct_value=expected_remaining,
             max_attempts=MAX_ATTEMPTS,
@@ -194,42 +272,51 @@ def play_game(max_rounds: int, style: Style) -> None:
         )
         ADAPT.update(ok2)
 
-        if defender == user1:
-            p1_hp = expected_remaining
-        else:
-            p2_hp = expected_remaining
+        hp[def_idx] = expected_remaining
 
-        print(style.wrap(f"📣 {attacker} hit {defender} for {actual_damage}. {defender} now has {expected_remaining} HP.\n", style.blue))
+        print(style.hit_tmpl.format(a=attacker, d=defender, dmg=actual_damage, hp=expected_remaining))
 
-        if p1_hp <= 0 or p2_hp <= 0:
+        if expected_remaining <= 0:
             break
 
-        attacker, defender = defender, attacker
+        def_idx ^= 1
         round_no += 1
 
-    print(style.wrap("===== 🏁 Match Over =====", style.bold))
+    p1_hp, p2_hp = hp
+
+    out = [style.wrap("===== 🏁 Match Over =====", style.bold)]
     if p1_hp <= 0 and p2_hp <= 0:
-        print("It's a draw! Both boxers are down!")
+        out.append("It's a draw! Both boxers are down!")
     elif p1_hp <= 0:
-        print(f"🏆 Winner: {user2}! {user1} has been defeated.")
+        out.append(f"🏆 Winner: {user2}! {user1} has been defeated.")
     elif p2_hp <= 0:
-        print(f"🏆 Winner: {user1}! {user2} has been defeated.")
+        out.append(f"🏆 Winner: {user1}! {user2} has been defeated.")
     else:
-        print(style.wrap("🧑‍⚖️ Time! Deciding by remaining life points...", style.bold))
-        print(f"Final HP — {user1}: {p1_hp}  |  {user2}: {p2_hp}")
+        out.append(style.wrap("🧑‍⚖️ Time! Deciding by remaining life points...", style.bold))
+        out.append(f"Final HP — {user1}: {p1_hp}  |  {user2}: {p2_hp}")
         if p1_hp > p2_hp:
-            print(f"🏆 Winner: {user1}!")
+            out.append(f"🏆 Winner: {user1}!")
         elif p2_hp > p1_hp:
-            print(f"🏆 Winner: {user2}!")
+            out.append(f"🏆 Winner: {user2}!")
         else:
-            print("Result: Draw.")
+            out.append("Result: Draw.")
+    sys.stdout.write("\n".join(out) + "\n")
 
-def parse_args(argv: List[str]) -> argparse.Namespace:
+_PARSER: Optional[argparse.ArgumentParser] = None
+
+def _build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(description="Boxing Math Game v3 — subtraction practice (adaptive difficulty; judges by remaining HP)")
     p.add_argument("--rounds", type=int, default=8, help="Max rounds (default: 8)")
     p.add_argument("--seed", type=int, default=None, help="Set RNG seed for reproducible runs")
     p.add_argument("--no-color", action="store_true", help="Disable colored output")
-    return p.parse_args(argv)
+    return p
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    # Built on first use and reused when main() runs more than once.
+    global _PARSER
+    if _PARSER is None:
+        _PARSER = _build_parser()
+    return _PARSER.parse_args(argv)
 
 def main():
     args = parse_args(sys.argv[1:])